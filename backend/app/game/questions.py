@@ -1,36 +1,70 @@
 import random
+from typing import NamedTuple
 
-QUESTIONS = [
-    {
-        "id": "q1",
-        "difficulty": "easy",
-        "question": "Quem construiu a arca?",
-        "options": ["Moisés", "Noé", "Abraão", "Davi"],
-        "correctIndex": 1,
-    },
-    {
-        "id": "q2",
-        "difficulty": "medium",
-        "question": "Quantos discípulos Jesus escolheu como apóstolos?",
-        "options": ["10", "11", "12", "13"],
-        "correctIndex": 2,
-    },
-    {
-        "id": "q3",
-        "difficulty": "hard",
-        "question": "Qual profeta enfrentou os profetas de Baal no Monte Carmelo?",
-        "options": ["Isaías", "Jeremias", "Elias", "Ezequiel"],
-        "correctIndex": 2,
-    },
-    {
-        "id": "q4",
-        "difficulty": "apocalyptic",
-        "question": "Quantas igrejas são mencionadas no Apocalipse (capítulos 2 e 3)?",
-        "options": ["5", "6", "7", "8"],
-        "correctIndex": 2,
-    },
-]
-
-
-def get_random_question():
-    return random.choice(QUESTIONS).copy()
+import orjson
+
+from backend.app.game.rules import DIFFICULTY_TIME_SECONDS
+
+
+class Question(NamedTuple):
+    id: str
+    difficulty: str
+    question: str
+    options: tuple[str, ...]
+    correct_index: int
+    # frame "question" pronto para o fio, montado uma única vez no import
+    wire_bytes: bytes
+
+
+def _make_question(
+    id: str, difficulty: str, question: str, options: tuple[str, ...], correct_index: int
+) -> Question:
+    wire_bytes = orjson.dumps({
+        "type": "question",
+        "payload": {
+            "questionId": id,
+            "difficulty": difficulty,
+            "duration": DIFFICULTY_TIME_SECONDS[difficulty],
+            "question": question,
+            "options": options,
+        },
+    })
+    return Question(id, difficulty, question, options, correct_index, wire_bytes)
+
+
+QUESTIONS: tuple[Question, ...] = (
+    _make_question(
+        "q1",
+        "easy",
+        "Quem construiu a arca?",
+        ("Moisés", "Noé", "Abraão", "Davi"),
+        1,
+    ),
+    _make_question(
+        "q2",
+        "medium",
+        "Quantos discípulos Jesus escolheu como apóstolos?",
+        ("10", "11", "12", "13"),
+        2,
+    ),
+    _make_question(
+        "q3",
+        "hard",
+        "Qual profeta enfrentou os profetas de Baal no Monte Carmelo?",
+        ("Isaías", "Jeremias", "Elias", "Ezequiel"),
+        2,
+    ),
+    _make_question(
+        "q4",
+        "apocalyptic",
+        "Quantas igrejas são mencionadas no Apocalipse (capítulos 2 e 3)?",
+        ("5", "6", "7", "8"),
+        2,
+    ),
+)
+
+_rng = random.Random()
+
+
+def get_random_question() -> Question:
+    return _rng.choice(QUESTIONS)
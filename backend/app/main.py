@@ -1,17 +1,28 @@
 from __future__ import annotations
 
+import re
 import uuid
 from pathlib import Path
 
+import msgspec
+import orjson
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from backend.app.ws.manager import RoomManager
-from backend.app.ws.messages import WSIn, WSOut, err
+from backend.app.ws.messages import ERR_BYTES, PONG_BYTES, WSIn, err_bytes
 
-app = FastAPI(title="Quiz Bíblico Multiplayer (MVP)")
+# event loop C-level; opcional (uvicorn[standard] já o instala)
+try:
+    import uvloop
+
+    uvloop.install()
+except ImportError:
+    pass
+
+app = FastAPI(title="Quiz Bíblico Multiplayer (MVP)", default_response_class=ORJSONResponse)
 
 # CORS (para facilitar durante desenvolvimento)
 app.add_middleware(
@@ -24,6 +35,30 @@ app.add_middleware(
 
 manager = RoomManager()
 
+# decoder C-level reutilizável para as mensagens de entrada
+_ws_decoder = msgspec.json.Decoder(WSIn)
+
+# nenhum payload legítimo chega perto disso; frames maiores são rejeitados
+# antes de qualquer parse de JSON
+MAX_FRAME_BYTES = 4096
+
+_PIN_RE = re.compile(r"^\d{4,}$")
+
+
+def _validate_name(payload: dict) -> str:
+    name = str(payload.get("name", "")).strip()
+    if not name:
+        raise ValueError("INVALID_NAME")
+    return name
+
+
+def _validate_join(payload: dict) -> tuple[str, str]:
+    name = _validate_name(payload)
+    pin = str(payload.get("pin", "")).strip()
+    if not _PIN_RE.match(pin):
+        raise ValueError("INVALID_PIN")
+    return name, pin
+
 # ---------------------------
 # Servir frontend (raiz /)
 # ---------------------------
@@ -44,12 +79,97 @@ def home():
 
 @app.get("/health")
 def health():
-    return JSONResponse({"status": "ok"})
+    return {"status": "ok"}
 
 
 # ---------------------------
 # WebSocket
 # ---------------------------
+async def _handle_ping(websocket: WebSocket, player_id: str, payload: dict) -> None:
+    await websocket.send_bytes(PONG_BYTES)
+
+
+async def _handle_create_room(websocket: WebSocket, player_id: str, payload: dict) -> None:
+    try:
+        name = _validate_name(payload)
+    except ValueError as e:
+        await websocket.send_bytes(ERR_BYTES[str(e)])
+        return
+
+    room = await manager.create_room(player_id, name)
+
+    await websocket.send_bytes(
+        orjson.dumps({"type": "room_created", "payload": {"playerId": player_id, "room": room.to_public_dict()}})
+    )
+
+    await manager.broadcast_room_state(room.pin)
+
+
+async def _handle_join_room(websocket: WebSocket, player_id: str, payload: dict) -> None:
+    try:
+        name, pin = _validate_join(payload)
+    except ValueError as e:
+        await websocket.send_bytes(ERR_BYTES[str(e)])
+        return
+
+    try:
+        room = await manager.join_room(player_id, name, pin)
+    except ValueError as e:
+        await websocket.send_bytes(err_bytes(str(e), "Erro ao entrar na sala."))
+        return
+
+    await websocket.send_bytes(
+        orjson.dumps({"type": "room_joined", "payload": {"playerId": player_id, "room": room.to_public_dict()}})
+    )
+
+    await manager.broadcast_room_state(pin)
+
+
+async def _handle_leave_room(websocket: WebSocket, player_id: str, payload: dict) -> None:
+    await manager.leave_room(player_id)
+    await websocket.send_bytes(orjson.dumps({"type": "room_state", "payload": {"left": True}}))
+
+
+async def _handle_start_game(websocket: WebSocket, player_id: str, payload: dict) -> None:
+    try:
+        room = await manager.start_game(player_id)
+    except ValueError as e:
+        await websocket.send_bytes(err_bytes(str(e), "Erro ao iniciar."))
+        return
+
+    # informa início (o payload já carrega o estado da sala)
+    await manager.broadcast_game_started(room.pin)
+    # A pergunta (question) é enviada pelo manager.start_game() -> start_round()
+
+
+async def _handle_answer(websocket: WebSocket, player_id: str, payload: dict) -> None:
+    try:
+        option_index = int(payload.get("optionIndex"))
+    except Exception:
+        await websocket.send_bytes(ERR_BYTES["INVALID_ANSWER"])
+        return
+
+    try:
+        await manager.submit_answer(player_id, option_index)
+    except ValueError as e:
+        await websocket.send_bytes(err_bytes(str(e), "Erro ao responder."))
+
+
+async def _handle_unknown(websocket: WebSocket, player_id: str, payload: dict) -> None:
+    await websocket.send_bytes(ERR_BYTES["UNKNOWN_ACTION"])
+
+
+# despacho O(1) por ação, no lugar da cadeia de comparações de string
+HANDLERS = {
+    "ping": _handle_ping,
+    "create_room": _handle_create_room,
+    "join_room": _handle_join_room,
+    "leave_room": _handle_leave_room,
+    "start_game": _handle_start_game,
+    "answer": _handle_answer,
+}
+
+
 @app.websocket("/ws")
 async def ws_endpoint(websocket: WebSocket):
     await manager.connect(websocket)
@@ -64,117 +184,26 @@ async def ws_endpoint(websocket: WebSocket):
         await manager.register_socket(player_id, websocket)
 
         # handshake: informa ao cliente qual playerId ele tem
-        await websocket.send_json(
-            WSOut(type="room_joined", payload={"playerId": player_id}).model_dump()
+        await websocket.send_bytes(
+            orjson.dumps({"type": "room_joined", "payload": {"playerId": player_id}})
         )
 
         while True:
-            raw = await websocket.receive_json()
-            msg = WSIn(**raw)
-
-            # Ping
-            if msg.action == "ping":
-                await websocket.send_json(WSOut(type="pong", payload={}).model_dump())
-                continue
-
-            # Criar sala
-            if msg.action == "create_room":
-                name = str(msg.payload.get("name", "")).strip()
-                if not name:
-                    await websocket.send_json(err("INVALID_NAME", "Informe seu nome.").model_dump())
-                    continue
-
-                room = await manager.create_room(player_id, name)
-
-                await websocket.send_json(
-                    WSOut(type="room_created", payload={"playerId": player_id, "room": room.to_public_dict()}).model_dump()
-                )
-
-                await manager.broadcast_room_state(room.pin)
-                continue
-
-            # Entrar na sala
-            if msg.action == "join_room":
-                name = str(msg.payload.get("name", "")).strip()
-                pin = str(msg.payload.get("pin", "")).strip()
-
-                if not name:
-                    await websocket.send_json(err("INVALID_NAME", "Informe seu nome.").model_dump())
-                    continue
-                if not pin.isdigit() or len(pin) < 4:
-                    await websocket.send_json(err("INVALID_PIN", "PIN inválido.").model_dump())
-                    continue
-
-                try:
-                    room = await manager.join_room(player_id, name, pin)
-                except ValueError as e:
-                    code = str(e)
-                    mapping = {
-                        "ROOM_NOT_FOUND": "Sala não encontrada.",
-                        "ROOM_ALREADY_STARTED": "A partida já começou.",
-                        "ROOM_FULL": "Sala cheia (máximo 4 jogadores).",
-                    }
-                    await websocket.send_json(err(code, mapping.get(code, "Erro ao entrar na sala.")).model_dump())
-                    continue
-
-                await websocket.send_json(
-                    WSOut(type="room_joined", payload={"playerId": player_id, "room": room.to_public_dict()}).model_dump()
-                )
-
-                await manager.broadcast_room_state(pin)
-                continue
-
-            # Sair da sala
-            if msg.action == "leave_room":
-                await manager.leave_room(player_id)
-                await websocket.send_json(WSOut(type="room_state", payload={"left": True}).model_dump())
-                continue
-
-            # Iniciar jogo (host)
-            if msg.action == "start_game":
-                try:
-                    room = await manager.start_game(player_id)
-                except ValueError as e:
-                    code = str(e)
-                    mapping = {
-                        "NOT_IN_ROOM": "Você não está em uma sala.",
-                        "ROOM_NOT_FOUND": "Sala não encontrada.",
-                        "NOT_HOST": "Apenas o host pode iniciar.",
-                        "NOT_ENOUGH_PLAYERS": "Não há jogadores suficientes.",
-                    }
-                    await websocket.send_json(err(code, mapping.get(code, "Erro ao iniciar.")).model_dump())
-                    continue
-
-                # Atualiza lobby e informa início
-                pin = room.pin
-                await manager.broadcast_room_state(pin)
-                await manager.broadcast_to_room(pin, {"type": "game_started", "payload": room.to_public_dict()})
-                # A pergunta (question) é enviada pelo manager.start_game() -> start_round()
-                continue
-
-            # Responder pergunta
-            if msg.action == "answer":
-                try:
-                    option_index = int(msg.payload.get("optionIndex"))
-                except Exception:
-                    await websocket.send_json(err("INVALID_ANSWER", "Resposta inválida.").model_dump())
-                    continue
-
-                try:
-                    await manager.submit_answer(player_id, option_index)
-                except ValueError as e:
-                    code = str(e)
-                    mapping = {
-                        "NOT_IN_ROOM": "Você não está em uma sala.",
-                        "NO_ACTIVE_ROUND": "Não há rodada ativa.",
-                        "ALREADY_ANSWERED": "Você já respondeu.",
-                        "TIME_OVER": "Tempo esgotado.",
-                    }
-                    await websocket.send_json(err(code, mapping.get(code, "Erro ao responder.")).model_dump())
-                continue
-
-            # Ação desconhecida
-            await websocket.send_json(err("UNKNOWN_ACTION", "Ação desconhecida.").model_dump())
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code") or 1000)
+
+            data = message.get("bytes")
+            if data is None:
+                data = (message.get("text") or "").encode()
+            if len(data) > MAX_FRAME_BYTES:
+                # frame grande demais: fecha antes de gastar CPU com parse
+                await websocket.close(code=1009)
+                raise WebSocketDisconnect(1009)
+
+            msg = _ws_decoder.decode(data)
+            handler = HANDLERS.get(msg.action, _handle_unknown)
+            await handler(websocket, player_id, msg.payload)
 
     except WebSocketDisconnect:
         await manager.disconnect(player_id)
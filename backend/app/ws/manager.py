@@ -1,25 +1,27 @@
 from __future__ import annotations
 
+import asyncio
 import secrets
-import string
 import time
 from dataclasses import dataclass, field
 from typing import Dict, Optional
 
+import orjson
 from fastapi import WebSocket
 
 from backend.app.game.questions import get_random_question
 from backend.app.game.rules import BASE_POINTS, DIFFICULTY_TIME_SECONDS, MAX_SPEED_BONUS
 
 MAX_PLAYERS = 4
+QUEUE_MAXSIZE = 32  # cliente que acumula 32 mensagens sem drenar é desconectado
 
 
 def _generate_pin(length: int = 6) -> str:
-    alphabet = string.digits
-    return "".join(secrets.choice(alphabet) for _ in range(length))
+    # um único sorteio do CSPRNG em vez de um secrets.choice por dígito
+    return f"{secrets.randbelow(10 ** length):0{length}d}"
 
 
-@dataclass
+@dataclass(slots=True)
 class Player:
     player_id: str
     name: str
@@ -27,37 +29,59 @@ class Player:
     score: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class RoundState:
     question_id: str
     difficulty: str
     question: str
-    options: list[str]
+    options: tuple[str, ...]
     correct_index: int
     started_at: float
     duration: int
     answers: Dict[str, int] = field(default_factory=dict)  # player_id -> optionIndex
+    # frame "question" pré-serializado (imutável durante a rodada)
+    question_bytes: bytes = b""
 
 
-@dataclass
+@dataclass(slots=True)
 class Room:
     pin: str
     host_player_id: str
     players: Dict[str, Player] = field(default_factory=dict)
     started: bool = False
     round: Optional[RoundState] = None
+    # cache do estado público (invalidado a cada mutação da sala)
+    _public_cache: Optional[dict] = field(default=None, repr=False)
+    _public_json: Optional[bytes] = field(default=None, repr=False)
+    _scoreboard_json: Optional[bytes] = field(default=None, repr=False)
+    # serializa mutações da sala entre awaits (join/saída/resposta concorrentes)
+    _lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+    # houve resposta desde o último scoreboard? (coalesce: 1 scoreboard por rodada)
+    _score_dirty: bool = field(default=False, repr=False)
+
+    def _invalidate(self) -> None:
+        self._public_cache = None
+        self._public_json = None
+        self._scoreboard_json = None
 
     def to_public_dict(self) -> dict:
-        return {
-            "pin": self.pin,
-            "started": self.started,
-            "maxPlayers": MAX_PLAYERS,
-            "players": [
-                {"id": p.player_id, "name": p.name, "isHost": p.is_host, "score": p.score}
-                for p in self.players.values()
-            ],
-            "count": len(self.players),
-        }
+        if self._public_cache is None:
+            self._public_cache = {
+                "pin": self.pin,
+                "started": self.started,
+                "maxPlayers": MAX_PLAYERS,
+                "players": [
+                    {"id": p.player_id, "name": p.name, "isHost": p.is_host, "score": p.score}
+                    for p in self.players.values()
+                ],
+                "count": len(self.players),
+            }
+        return self._public_cache
+
+    def to_public_json(self) -> bytes:
+        if self._public_json is None:
+            self._public_json = orjson.dumps(self.to_public_dict())
+        return self._public_json
 
 
 class RoomManager:
@@ -65,12 +89,31 @@ class RoomManager:
         self.rooms: Dict[str, Room] = {}
         self.sockets: Dict[str, WebSocket] = {}   # player_id -> websocket
         self.player_room: Dict[str, str] = {}     # player_id -> pin
+        self.queues: Dict[str, asyncio.Queue] = {}   # player_id -> fila de saída
+        self.writers: Dict[str, asyncio.Task] = {}   # player_id -> task que drena a fila
 
     async def connect(self, websocket: WebSocket) -> None:
         await websocket.accept()
 
     async def register_socket(self, player_id: str, websocket: WebSocket) -> None:
         self.sockets[player_id] = websocket
+        self.queues[player_id] = asyncio.Queue(maxsize=QUEUE_MAXSIZE)
+        self.writers[player_id] = asyncio.create_task(self._relay(player_id))
+
+    async def _relay(self, player_id: str) -> None:
+        # task dedicada por jogador: drena a fila e escreve no socket,
+        # isolando o resto da sala de um consumidor lento
+        ws = self.sockets[player_id]
+        queue = self.queues[player_id]
+        try:
+            while True:
+                data = await queue.get()
+                await ws.send_bytes(data)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # socket morto: agenda a remoção (cancelar a própria task aqui travaria)
+            asyncio.create_task(self.disconnect(player_id))
 
     def _ensure_unique_pin(self) -> str:
         for _ in range(50):
@@ -83,6 +126,10 @@ class RoomManager:
         if not player_id:
             return
 
+        writer = self.writers.pop(player_id, None)
+        if writer is not None:
+            writer.cancel()
+        self.queues.pop(player_id, None)
         self.sockets.pop(player_id, None)
 
         pin = self.player_room.pop(player_id, None)
@@ -93,19 +140,22 @@ class RoomManager:
         if not room:
             return
 
-        was_host = False
-        if player_id in room.players:
-            was_host = room.players[player_id].is_host
-            room.players.pop(player_id, None)
+        async with room._lock:
+            was_host = False
+            if player_id in room.players:
+                was_host = room.players[player_id].is_host
+                room.players.pop(player_id, None)
 
-        if len(room.players) == 0:
-            self.rooms.pop(pin, None)
-            return
+            if len(room.players) == 0:
+                self.rooms.pop(pin, None)
+                return
+
+            if was_host:
+                new_host = next(iter(room.players.values()))
+                new_host.is_host = True
+                room.host_player_id = new_host.player_id
 
-        if was_host:
-            new_host = next(iter(room.players.values()))
-            new_host.is_host = True
-            room.host_player_id = new_host.player_id
+            room._invalidate()
 
         await self.broadcast_room_state(pin)
 
@@ -121,13 +171,16 @@ class RoomManager:
         room = self.rooms.get(pin)
         if not room:
             raise ValueError("ROOM_NOT_FOUND")
-        if room.started:
-            raise ValueError("ROOM_ALREADY_STARTED")
-        if len(room.players) >= MAX_PLAYERS:
-            raise ValueError("ROOM_FULL")
 
-        room.players[player_id] = Player(player_id=player_id, name=name, is_host=False)
-        self.player_room[player_id] = pin
+        async with room._lock:
+            if room.started:
+                raise ValueError("ROOM_ALREADY_STARTED")
+            if len(room.players) >= MAX_PLAYERS:
+                raise ValueError("ROOM_FULL")
+
+            room.players[player_id] = Player(player_id=player_id, name=name, is_host=False)
+            room._invalidate()
+            self.player_room[player_id] = pin
         return room
 
     async def leave_room(self, player_id: str) -> None:
@@ -143,7 +196,9 @@ class RoomManager:
         if room.host_player_id != player_id:
             raise ValueError("NOT_HOST")
 
-        room.started = True
+        async with room._lock:
+            room.started = True
+            room._invalidate()
         # inicia primeira rodada imediatamente
         await self.start_round(pin)
         return room
@@ -154,17 +209,16 @@ class RoomManager:
             return
 
         q = get_random_question()
-        difficulty = q["difficulty"]
-        duration = DIFFICULTY_TIME_SECONDS[difficulty]
 
         room.round = RoundState(
-            question_id=q["id"],
-            difficulty=difficulty,
-            question=q["question"],
-            options=q["options"],
-            correct_index=q["correctIndex"],
-            started_at=time.time(),
-            duration=duration,
+            question_id=q.id,
+            difficulty=q.difficulty,
+            question=q.question,
+            options=q.options,
+            correct_index=q.correct_index,
+            started_at=time.monotonic(),
+            duration=DIFFICULTY_TIME_SECONDS[q.difficulty],
+            question_bytes=q.wire_bytes,
         )
 
         # envia pergunta para todos
@@ -178,26 +232,31 @@ class RoomManager:
         if not room or not room.round:
             raise ValueError("NO_ACTIVE_ROUND")
 
-        rnd = room.round
-        if player_id in rnd.answers:
-            raise ValueError("ALREADY_ANSWERED")
-
-        # checa tempo
-        now = time.time()
-        if now > rnd.started_at + rnd.duration:
-            raise ValueError("TIME_OVER")
-
-        rnd.answers[player_id] = int(option_index)
-
-        # calcula resultado individual imediato
-        correct = (int(option_index) == rnd.correct_index)
-        gained = 0
-        if correct:
-            elapsed = now - rnd.started_at
-            remaining = max(0.0, rnd.duration - elapsed)
-            speed_bonus = int(MAX_SPEED_BONUS * (remaining / rnd.duration))
-            gained = BASE_POINTS + speed_bonus
-            room.players[player_id].score += gained
+        async with room._lock:
+            rnd = room.round
+            if not rnd:
+                raise ValueError("NO_ACTIVE_ROUND")
+            if player_id in rnd.answers:
+                raise ValueError("ALREADY_ANSWERED")
+
+            # checa tempo
+            now = time.monotonic()
+            if now > rnd.started_at + rnd.duration:
+                raise ValueError("TIME_OVER")
+
+            rnd.answers[player_id] = int(option_index)
+            room._score_dirty = True
+
+            # calcula resultado individual imediato
+            correct = (int(option_index) == rnd.correct_index)
+            gained = 0
+            if correct:
+                elapsed = now - rnd.started_at
+                remaining = max(0.0, rnd.duration - elapsed)
+                speed_bonus = int(MAX_SPEED_BONUS * (remaining / rnd.duration))
+                gained = BASE_POINTS + speed_bonus
+                room.players[player_id].score += gained
+                room._invalidate()
 
         await self.send_to_player(player_id, {
             "type": "answer_result",
@@ -219,8 +278,10 @@ class RoomManager:
 
         rnd = room.round
 
-        # broadcast placar
-        await self.broadcast_scoreboard(pin)
+        # broadcast placar — no máximo um por rodada, e só se houve resposta
+        if room._score_dirty:
+            room._score_dirty = False
+            await self.broadcast_scoreboard(pin)
 
         # encerra rodada
         room.round = None
@@ -241,47 +302,63 @@ class RoomManager:
         room = self.rooms.get(pin)
         if not room:
             return
-        await self.broadcast_to_room(pin, {"type": "room_state", "payload": room.to_public_dict()})
+        data = b'{"type":"room_state","payload":' + room.to_public_json() + b"}"
+        await self.broadcast_bytes(pin, data)
+
+    async def broadcast_game_started(self, pin: str) -> None:
+        room = self.rooms.get(pin)
+        if not room:
+            return
+        # um único frame: o payload de game_started já é o estado da sala
+        data = b'{"type":"game_started","payload":' + room.to_public_json() + b"}"
+        await self.broadcast_bytes(pin, data)
 
     async def broadcast_question(self, pin: str) -> None:
         room = self.rooms.get(pin)
         if not room or not room.round:
             return
-        rnd = room.round
-        payload = {
-            "questionId": rnd.question_id,
-            "difficulty": rnd.difficulty,
-            "duration": rnd.duration,
-            "question": rnd.question,
-            "options": rnd.options,
-        }
-        await self.broadcast_to_room(pin, {"type": "question", "payload": payload})
+        await self.broadcast_bytes(pin, room.round.question_bytes)
 
     async def broadcast_scoreboard(self, pin: str) -> None:
         room = self.rooms.get(pin)
         if not room:
             return
-        payload = {
-            "pin": room.pin,
-            "players": sorted(
-                [{"id": p.player_id, "name": p.name, "score": p.score, "isHost": p.is_host} for p in room.players.values()],
-                key=lambda x: x["score"],
-                reverse=True
-            )
-        }
-        await self.broadcast_to_room(pin, {"type": "scoreboard", "payload": payload})
+        # reconstruído (e reordenado) só quando a sala mudou desde o último envio
+        if room._scoreboard_json is None:
+            payload = {
+                "pin": room.pin,
+                "players": sorted(
+                    [{"id": p.player_id, "name": p.name, "score": p.score, "isHost": p.is_host} for p in room.players.values()],
+                    key=lambda x: x["score"],
+                    reverse=True
+                )
+            }
+            room._scoreboard_json = orjson.dumps({"type": "scoreboard", "payload": payload})
+        await self.broadcast_bytes(pin, room._scoreboard_json)
 
     async def broadcast_to_room(self, pin: str, message: dict) -> None:
+        # serializa uma única vez; cada send reaproveita os mesmos bytes
+        await self.broadcast_bytes(pin, orjson.dumps(message))
+
+    async def broadcast_bytes(self, pin: str, data: bytes) -> None:
         room = self.rooms.get(pin)
         if not room:
             return
-        for pid in list(room.players.keys()):
-            ws = self.sockets.get(pid)
-            if ws:
-                await ws.send_json(message)
+        # fan-out vira O(1) por jogador: só enfileira; quem escreve é o _relay.
+        # iterar players direto é seguro: não há await até o fim do loop
+        for pid in room.players:
+            self._enqueue(pid, data)
+
+    def _enqueue(self, player_id: str, data: bytes) -> None:
+        queue = self.queues.get(player_id)
+        if queue is None:
+            return
+        try:
+            queue.put_nowait(data)
+        except asyncio.QueueFull:
+            # consumidor não drena: desconecta em vez de represar a sala
+            asyncio.create_task(self.disconnect(player_id))
 
     async def send_to_player(self, player_id: str, message: dict) -> None:
-        ws = self.sockets.get(player_id)
-        if ws:
-            await ws.send_json(message)
+        self._enqueue(player_id, orjson.dumps(message))
 
@@ -1,39 +1,49 @@
 from __future__ import annotations
 
-from typing import Any, Literal, Optional
-from pydantic import BaseModel, Field
-
-
-class WSIn(BaseModel):
-    action: Literal[
-        "create_room",
-        "join_room",
-        "leave_room",
-        "start_game",
-        "answer",
-        "ping",
-    ]
-    payload: dict[str, Any] = Field(default_factory=dict)
-
-
-class WSOut(BaseModel):
-    type: Literal[
-        "room_created",
-        "room_joined",
-        "room_state",
-        "game_started",
-        "question",
-        "answer_result",
-        "scoreboard",
-        "round_ended",
-        "error",
-        "pong",
-    ]
-    payload: dict[str, Any] = Field(default_factory=dict)
-
-
-def err(code: str, message: str, extra: Optional[dict[str, Any]] = None) -> WSOut:
+from typing import Any, Optional
+
+import msgspec
+import orjson
+
+
+class WSIn(msgspec.Struct):
+    action: str
+    payload: dict[str, Any] = {}
+
+
+def err(code: str, message: str, extra: Optional[dict[str, Any]] = None) -> dict[str, Any]:
     payload: dict[str, Any] = {"code": code, "message": message}
     if extra:
         payload.update(extra)
-    return WSOut(type="error", payload=payload)
+    return {"type": "error", "payload": payload}
+
+
+# frames constantes pré-serializados no import: resposta vira um lookup
+PONG_BYTES = orjson.dumps({"type": "pong", "payload": {}})
+
+_ERROR_MESSAGES = {
+    "INVALID_NAME": "Informe seu nome.",
+    "INVALID_PIN": "PIN inválido.",
+    "INVALID_ANSWER": "Resposta inválida.",
+    "ROOM_NOT_FOUND": "Sala não encontrada.",
+    "ROOM_ALREADY_STARTED": "A partida já começou.",
+    "ROOM_FULL": "Sala cheia (máximo 4 jogadores).",
+    "NOT_IN_ROOM": "Você não está em uma sala.",
+    "NOT_HOST": "Apenas o host pode iniciar.",
+    "NOT_ENOUGH_PLAYERS": "Não há jogadores suficientes.",
+    "NO_ACTIVE_ROUND": "Não há rodada ativa.",
+    "ALREADY_ANSWERED": "Você já respondeu.",
+    "TIME_OVER": "Tempo esgotado.",
+    "UNKNOWN_ACTION": "Ação desconhecida.",
+}
+
+ERR_BYTES: dict[str, bytes] = {
+    code: orjson.dumps(err(code, message)) for code, message in _ERROR_MESSAGES.items()
+}
+
+
+def err_bytes(code: str, fallback: str) -> bytes:
+    data = ERR_BYTES.get(code)
+    if data is None:
+        data = orjson.dumps(err(code, fallback))
+    return data
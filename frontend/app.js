@@ -43,6 +43,8 @@ function connectWS() {
   setWsStatus("Conectando...");
   const url = wsUrl();
   const ws = new WebSocket(url);
+  // servidor envia frames binários (JSON pré-serializado)
+  ws.binaryType = "arraybuffer";
   state.ws = ws;
 
   ws.onopen = () => setWsStatus("Conectado");
@@ -50,7 +52,8 @@ function connectWS() {
   ws.onerror = () => setWsStatus("Erro");
 
   ws.onmessage = (ev) => {
-    const msg = JSON.parse(ev.data);
+    const raw = typeof ev.data === "string" ? ev.data : new TextDecoder().decode(ev.data);
+    const msg = JSON.parse(raw);
 
     if (msg.type === "room_joined" && msg.payload?.playerId) {
       // handshake: server informa playerId
@@ -86,6 +89,10 @@ function connectWS() {
     }
 
     if (msg.type === "game_started") {
+      // o payload é o estado autoritativo da sala (substitui o room_state extra)
+      state.room = msg.payload;
+      state.isHost = !!state.room.players?.find(p => p.id === state.playerId)?.isHost;
+      renderRoomState(state.room);
       showScreen("screen-game");
       return;
     }